@@ -1,3 +1,5 @@
+import os
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -7,6 +9,37 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+# Polars is an optional fast path for the heavy ETL: its lazy engine fuses
+# projections, pushes column selection down into the CSV scan and runs the
+# joins/aggregations on all cores. The pandas pipeline below remains the
+# fallback when polars is not installed.
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Numba is an optional fast path for the temporal feature block: one compiled
+# parallel pass over DATE instead of seven separate .dt scans.
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# numexpr fuses elementwise expression chains into a single streaming kernel,
+# avoiding one temporary array per subexpression on the discount features.
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+# Shared engine_kwargs for pandas groupby reductions on the numba engine
+NUMBA_ENGINE_KWARGS = {'parallel': True, 'nogil': True}
+
+# 2^10 HyperLogLog registers per group: ~3% relative error on the approximate
+# distinct counts, and the register matrix for the ~92k-product rollup stays
+# under 100 MB (precision 12 would take 4x the memory for 1.6% error).
+HLL_PRECISION = 10
+
 # Configure Streamlit page for optimal senior user experience
 st.set_page_config(
     page_title="Retail Analytics Dashboard",
@@ -15,42 +48,43 @@ st.set_page_config(
     initial_sidebar_state="collapsed"  # Simpler single-page view
 )
 
-# Custom CSS for Senior-Friendly Design - Larger fonts, high contrast, clear spacing
-st.markdown("""
+# Custom CSS for Senior-Friendly Design - Larger fonts, high contrast, clear
+# spacing. A module-level constant: built once at import, not per rerun.
+CSS = """
     <style>
     /* Increase base font size for better readability */
     .stApp {
         font-size: 16px;
     }
-    
+
     /* Large, prominent headers */
     h1 {
         font-size: 42px !important;
         color: #1f4788;
         font-weight: bold;
     }
-    
+
     h2 {
         font-size: 32px !important;
         color: #2c5aa0;
         margin-top: 30px;
     }
-    
+
     h3 {
         font-size: 24px !important;
         color: #3d6bb3;
     }
-    
+
     /* Large metric displays */
     [data-testid="stMetricValue"] {
         font-size: 36px !important;
         font-weight: bold;
     }
-    
+
     [data-testid="stMetricLabel"] {
         font-size: 18px !important;
     }
-    
+
     /* High contrast buttons */
     .stButton button {
         font-size: 18px;
@@ -61,337 +95,929 @@ st.markdown("""
         border: none;
         font-weight: bold;
     }
-    
+
     .stButton button:hover {
         background-color: #2c5aa0;
     }
-    
+
     /* Clear spacing between sections */
     .block-container {
         padding-top: 2rem;
         padding-bottom: 2rem;
     }
-    
+
     /* Accessible select boxes */
     .stSelectbox label {
         font-size: 18px !important;
         font-weight: bold;
     }
     </style>
-""", unsafe_allow_html=True)
-
-# Load datasets
-transaction_data =  pd.read_csv('datasets/transaction_data.csv')
-product = pd.read_csv('datasets/product.csv')
-hh_demographic = pd.read_csv('datasets/hh_demographic.csv')
-campaign_table = pd.read_csv('datasets/campaign_table.csv')
-campaign_desc = pd.read_csv('datasets/campaign_desc.csv')
-
-# Define the start date (Day 1)
-start_date = pd.to_datetime('2023-01-01')
-
-# Calculate the new 'DATE' column:
-# 1. Access the 'DAY' column in your DataFrame.
-# 2. Subtract 1 (since Day 1 has a zero-day offset).
-# 3. Use pd.to_timedelta to convert the day difference into a time difference.
-# 4. Add the timedelta to the start_date.
-
-transaction_data['DATE'] = start_date + pd.to_timedelta(
-    transaction_data['DAY'] - 1, 
-    unit='D'
-)
+"""
+
+
+def inject_css():
+    """Emit the custom CSS.
+
+    The style element has to be re-emitted on every run - Streamlit removes
+    elements that a rerun does not recreate, so a session-state "inject once"
+    guard would drop the styling after the first widget interaction. Keeping
+    the blob as a module constant at least avoids rebuilding the string.
+    """
+    st.markdown(CSS, unsafe_allow_html=True)
+
+
+# Cached ETL pipeline
+# Streamlit reruns this whole script on every widget interaction, so the CSV
+# loads and merges below are wrapped in @st.cache_data functions: the first run
+# pays the full cost, every rerun is a memoized lookup. Every cached function
+# is zero-argument and pulls its inputs from the cached stage before it, so
+# cache keys depend only on the function identity - passing DataFrames between
+# cached functions would rehash millions of rows per call (or, keyed by id(),
+# miss on every rerun, since st.cache_data hands out a fresh copy each time).
+
+# Explicit dtypes for the CSV loads. read_csv defaults to int64/float64/object,
+# which is 2-4x more bytes per cell than these columns need; the smaller frames
+# make every downstream merge/groupby scan fewer bytes. BASKET_ID stays int64
+# because basket ids run up to ~4.2e10, past the int32 range.
+TRANSACTION_DTYPES = {
+    'household_key': 'int32',
+    'BASKET_ID': 'int64',
+    'DAY': 'int16',
+    'PRODUCT_ID': 'int32',
+    'QUANTITY': 'int32',          # fuel quantities reach ~90k, too big for int16
+    'SALES_VALUE': 'float32',
+    'STORE_ID': 'int32',
+    'RETAIL_DISC': 'float32',
+    'TRANS_TIME': 'int16',
+    'WEEK_NO': 'int16',
+    'COUPON_DISC': 'float32',
+    'COUPON_MATCH_DISC': 'float32',
+}
+
+# Low-cardinality strings as category: stored once per distinct value, and
+# groupbys/joins run on the integer codes instead of hashing Python objects.
+PRODUCT_DTYPES = {
+    'PRODUCT_ID': 'int32',
+    'MANUFACTURER': 'int32',
+    'DEPARTMENT': 'category',
+    'BRAND': 'category',
+    'COMMODITY_DESC': 'category',
+    'SUB_COMMODITY_DESC': 'category',
+    'CURR_SIZE_OF_PRODUCT': 'category',
+}
+
+DEMOGRAPHIC_DTYPES = {
+    'household_key': 'int32',
+    'classification_1': 'category',
+    'classification_2': 'category',
+    'classification_3': 'category',
+    'HOMEOWNER_DESC': 'category',
+    'classification_5': 'category',
+    'KID_CATEGORY_DESC': 'category',
+}
+
+CAMPAIGN_TABLE_DTYPES = {
+    'DESCRIPTION': 'category',
+    'household_key': 'int32',
+    'CAMPAIGN': 'int16',
+}
+
+CAMPAIGN_DESC_DTYPES = {
+    'DESCRIPTION': 'category',
+    'CAMPAIGN': 'int16',
+    'START_DAY': 'int16',
+    'END_DAY': 'int16',
+}
+
+
+def data_path(name):
+    """Prefer the Parquet copy written by prepare_parquet.py over the raw CSV."""
+    parquet = f'datasets/{name}.parquet'
+    if os.path.exists(parquet):
+        return parquet
+    return f'datasets/{name}.csv'
+
+
+def read_table(name, dtypes):
+    """Read one source table, from Parquet when available (typed, compressed,
+    no text parsing) and otherwise from the CSV with the explicit dtype map."""
+    path = data_path(name)
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, engine='pyarrow')
+    return pd.read_csv(path, dtype=dtypes)
+
+
+@st.cache_data(show_spinner=False)
+def load_product():
+    """Read the product catalogue; small enough to load eagerly on both paths."""
+    return read_table('product', PRODUCT_DTYPES)
+
+
+@st.cache_data(show_spinner=False)
+def load_raw():
+    """Read the five source tables once; reruns reuse the cached copies."""
+    transaction_data = read_table('transaction_data', TRANSACTION_DTYPES)
+    product = load_product()
+    hh_demographic = read_table('hh_demographic', DEMOGRAPHIC_DTYPES)
+    campaign_table = read_table('campaign_table', CAMPAIGN_TABLE_DTYPES)
+    campaign_desc = read_table('campaign_desc', CAMPAIGN_DESC_DTYPES)
+    return transaction_data, product, hh_demographic, campaign_table, campaign_desc
+
+
+def scan_table(name):
+    """Lazy polars scan of one source table, preferring the Parquet copy."""
+    path = data_path(name)
+    if path.endswith('.parquet'):
+        return pl.scan_parquet(path)
+    return pl.scan_csv(path)
+
+
+@st.cache_data(show_spinner=False)
+def build_df_polars():
+    """Polars lazy-frame port of build_df.
+
+    The whole query is declared lazily so the optimizer can prune columns at
+    the scan, push the join keys down and parallelize the joins; .collect()
+    runs it once in streaming mode and only the final frame crosses back to
+    pandas for the Plotly/aggregate layer.
+    """
+    start_date = datetime(2023, 1, 1)
+
+    transaction_data = scan_table('transaction_data')
+    product = scan_table('product')
+    hh_demographic = scan_table('hh_demographic')
+    campaign_table = scan_table('campaign_table')
+
+    # First campaign per household (if multiple campaigns)
+    campaign_participation = (
+        campaign_table
+        .select(['household_key', 'CAMPAIGN', 'DESCRIPTION'])
+        .unique(subset='household_key', keep='first', maintain_order=True)
+        .with_columns(pl.lit(1).alias('IN_CAMPAIGN'))
+    )
 
-# Convert 'START_DAY' to 'START_DATE' in campaign table
-campaign_desc['START_DATE'] = start_date + pd.to_timedelta(
-    campaign_desc['START_DAY'] - 1, 
-    unit='D'
-)
+    lf = (
+        transaction_data
+        # Add product information to transactions
+        .join(
+            product.select(['PRODUCT_ID', 'DEPARTMENT', 'BRAND', 'COMMODITY_DESC']),
+            on='PRODUCT_ID',
+            how='left'
+        )
+        # Add demographic information (select key classification variables)
+        .join(
+            hh_demographic.select(['household_key', 'classification_1', 'classification_2',
+                                   'classification_3', 'classification_5']),
+            on='household_key',
+            how='left'
+        )
+        # Rename for clarity
+        .rename({
+            'classification_1': 'DEMOGRAPHIC_GROUP',      # Group1 through Group6
+            'classification_2': 'DEMOGRAPHIC_TYPE',        # X, Y, Z
+            'classification_3': 'DEMOGRAPHIC_LEVEL',       # Level1 through Level12
+            'classification_5': 'SHOPPING_SEGMENT'         # Group1 through Group6
+        })
+        # Add campaign participation
+        .join(campaign_participation, on='household_key', how='left')
+        .with_columns([
+            # Day 1 has a zero-day offset, hence DAY - 1
+            (pl.lit(start_date) + pl.duration(days=pl.col('DAY') - 1)).alias('DATE'),
+            pl.col('IN_CAMPAIGN').fill_null(0),
+            pl.col('DESCRIPTION').fill_null('No Campaign').alias('CAMPAIGN_TYPE'),
+            # Discount features (for price optimization ML)
+            (pl.col('COUPON_MATCH_DISC') +
+             pl.col('COUPON_DISC') +
+             pl.col('RETAIL_DISC')).alias('TOTAL_DISCOUNT'),
+        ])
+        .with_columns([
+            # Temporal features (critical for time-series forecasting)
+            pl.col('DATE').dt.month().alias('MONTH'),
+            pl.col('DATE').dt.strftime('%B').alias('MONTH_NAME'),
+            # polars weekday is 1 (Monday) .. 7 (Sunday); pandas uses 0..6
+            (pl.col('DATE').dt.weekday() - 1).alias('DAY_OF_WEEK'),
+            pl.col('DATE').dt.strftime('%A').alias('DAY_NAME'),
+            pl.col('DATE').dt.quarter().alias('QUARTER'),
+            pl.col('DATE').dt.year().alias('YEAR'),
+            (pl.col('DATE').dt.weekday() >= 6).cast(pl.Int64).alias('IS_WEEKEND'),
+            (pl.col('TOTAL_DISCOUNT') /
+             (pl.col('SALES_VALUE') + pl.col('TOTAL_DISCOUNT'))).fill_nan(0).alias('DISCOUNT_RATE'),
+            # Revenue features
+            pl.col('SALES_VALUE').alias('NET_REVENUE'),  # Already net of discounts
+            (pl.col('SALES_VALUE') / pl.col('QUANTITY')).alias('UNIT_PRICE'),
+            (pl.col('TOTAL_DISCOUNT') > 0).cast(pl.Int64).alias('HAS_DISCOUNT'),
+        ])
+        # Match the pandas path's projection; the optimizer prunes these
+        # columns all the way down into the scan.
+        .drop(['DAY', 'TRANS_TIME', 'WEEK_NO'])
+    )
 
-# Convert 'END_DAY' to 'END_DATE' in campaign table
-campaign_desc['END_DATE'] = start_date + pd.to_timedelta(
-    campaign_desc['END_DAY'] - 1, 
-    unit='D'
-)
+    return lf.collect(engine='streaming').to_pandas()
+
+
+NS_PER_DAY = 86_400_000_000_000
+
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December']
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+             'Saturday', 'Sunday']
+
+if njit is not None:
+    # error_model='numpy' guarantees IEEE inf/nan on the zero-denominator
+    # rows (QUANTITY == 0, SALES_VALUE + discount == 0) instead of numba's
+    # default python semantics, which would raise ZeroDivisionError.
+    @njit(parallel=True, cache=True, error_model='numpy')
+    def _feature_kernel(days, sales, qty, retail_disc, coupon_disc,
+                        coupon_match_disc, month, dow, quarter, year,
+                        is_weekend, total_discount, discount_rate,
+                        unit_price, has_discount):
+        """All per-row engineered features in one fused parallel pass.
+
+        The schema is fixed, so instead of pandas' one-temporary-per-
+        subexpression chain (seven .dt scans plus the discount/price
+        arithmetic) a single loop reads each row once and writes every
+        output while it is in register. The date split uses the standard
+        civil_from_days algorithm on epoch days; Monday is 0 to match
+        pandas dayofweek (1970-01-01 was a Thursday).
+        """
+        for i in prange(days.shape[0]):
+            d = days[i]
+            dow[i] = (d + 3) % 7
+            is_weekend[i] = 1 if dow[i] >= 5 else 0
+            z = d + 719468
+            era = z // 146097
+            doe = z - era * 146097
+            yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+            doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+            mp = (5 * doy + 2) // 153
+            m = mp + 3 if mp < 10 else mp - 9
+            month[i] = m
+            quarter[i] = (m - 1) // 3 + 1
+            year[i] = yoe + era * 400 + (1 if m <= 2 else 0)
+
+            td = coupon_match_disc[i] + coupon_disc[i] + retail_disc[i]
+            total_discount[i] = td
+            rate = td / (sales[i] + td)
+            # 0/0 rows fill as 0, matching the pandas fillna; signed
+            # infinities from near-zero denominators pass through unchanged
+            discount_rate[i] = 0.0 if rate != rate else rate
+            unit_price[i] = sales[i] / qty[i]
+            has_discount[i] = 1 if td > 0 else 0
+
+    @njit(cache=True)
+    def _basket_kernel(codes, sales, qty, disc, ngroups):
+        """Per-basket sums plus each basket's first row index in one pass.
+
+        The serial loop scatters into dense accumulators indexed by the
+        factorized basket code; first_idx lets the caller gather the
+        within-basket-constant columns (household, store, date, campaign)
+        without a groupby.
+        """
+        sum_sales = np.zeros(ngroups, dtype=np.float64)
+        sum_qty = np.zeros(ngroups, dtype=np.int64)
+        sum_disc = np.zeros(ngroups, dtype=np.float64)
+        first_idx = np.full(ngroups, -1, dtype=np.int64)
+        for i in range(codes.shape[0]):
+            g = codes[i]
+            sum_sales[g] += sales[i]
+            sum_qty[g] += qty[i]
+            sum_disc[g] += disc[i]
+            if first_idx[g] < 0:
+                first_idx[g] = i
+        return sum_sales, sum_qty, sum_disc, first_idx
+
+    @njit(cache=True)
+    def _customer_kernel(codes, store_codes, sales, qty, disc, date_ns,
+                         ngroups, nstores):
+        """All seven customer stats in one pass over the basket rows.
+
+        Instead of one groupby hash build per aggregation, the household
+        codes index dense per-group accumulator arrays (structure-of-arrays),
+        so every basket row is touched exactly once. Store nunique uses a
+        small group x store seen matrix; both cardinalities are tiny
+        (~2.5k households, a few hundred stores).
+        """
+        trips = np.zeros(ngroups, dtype=np.int64)
+        sum_sales = np.zeros(ngroups, dtype=np.float64)
+        sum_qty = np.zeros(ngroups, dtype=np.int64)
+        sum_disc = np.zeros(ngroups, dtype=np.float64)
+        min_date = np.full(ngroups, np.int64(2**62), dtype=np.int64)
+        max_date = np.full(ngroups, np.int64(-2**62), dtype=np.int64)
+        seen = np.zeros((ngroups, nstores), dtype=np.uint8)
+        for i in range(codes.shape[0]):
+            g = codes[i]
+            trips[g] += 1
+            sum_sales[g] += sales[i]
+            sum_qty[g] += qty[i]
+            sum_disc[g] += disc[i]
+            d = date_ns[i]
+            if d < min_date[g]:
+                min_date[g] = d
+            if d > max_date[g]:
+                max_date[g] = d
+            seen[g, store_codes[i]] = 1
+        num_stores = np.zeros(ngroups, dtype=np.int64)
+        for g in range(ngroups):
+            count = 0
+            for s in range(nstores):
+                count += seen[g, s]
+            num_stores[g] = count
+        return trips, sum_sales, sum_qty, sum_disc, min_date, max_date, num_stores
+
+    @njit(cache=True)
+    def _groupby_hll(codes, values, ngroups, p):
+        """Per-group approximate distinct counts via HyperLogLog.
+
+        Exact nunique builds a hash set per group; for the product rollup
+        that is ~92k sets over 2.6M rows. HLL replaces them with a fixed
+        (ngroups x 2^p) register matrix updated in one pass - a splitmix64
+        hash picks the register and the trailing-zero rank - and reads the
+        estimate back per group with the usual small-range correction.
+        Relative error is about 1.04 / sqrt(2^p).
+        """
+        m = 1 << p
+        registers = np.zeros((ngroups, m), dtype=np.uint8)
+        mask = np.uint64(m - 1)
+        shift = np.uint64(p)
+        one = np.uint64(1)
+        maxrank = 64 - p
+        for i in range(codes.shape[0]):
+            h = np.uint64(values[i]) + np.uint64(0x9E3779B97F4A7C15)
+            h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            h = h ^ (h >> np.uint64(31))
+            idx = h & mask
+            w = h >> shift
+            rank = 1
+            while (w & one) == 0 and rank < maxrank:
+                rank += 1
+                w >>= one
+            g = codes[i]
+            if registers[g, idx] < rank:
+                registers[g, idx] = rank
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        estimates = np.empty(ngroups, dtype=np.int64)
+        for g in range(ngroups):
+            inverse_sum = 0.0
+            zeros = 0
+            for j in range(m):
+                r = registers[g, j]
+                inverse_sum += 2.0 ** (-np.float64(r))
+                if r == 0:
+                    zeros += 1
+            e = alpha * m * m / inverse_sum
+            if e <= 2.5 * m and zeros > 0:
+                e = m * np.log(m / zeros)
+            estimates[g] = np.int64(e + 0.5)
+        return estimates
+
+
+@st.cache_data(show_spinner=False)
+def build_df():
+    """Merge transactions with product/demographic/campaign data and engineer features."""
+    transaction_data, product, hh_demographic, campaign_table, campaign_desc = load_raw()
+
+    # Define the start date (Day 1)
+    start_date = pd.to_datetime('2023-01-01')
+
+    # Calculate the new 'DATE' column as int64 nanosecond arithmetic on the
+    # underlying arrays: start + (DAY - 1) days (Day 1 has a zero-day offset)
+    # is a single fused multiply-add per row, with no TimedeltaIndex
+    # temporary between the offsets and the dates.
+    start_ns = np.int64(pd.Timestamp(start_date).value)
+    transaction_data['DATE'] = (
+        start_ns + (transaction_data['DAY'].to_numpy(np.int64) - 1) * NS_PER_DAY
+    ).view('datetime64[ns]')
+
+    # Convert 'START_DAY' to 'START_DATE' in campaign table
+    campaign_desc['START_DATE'] = (
+        start_ns + (campaign_desc['START_DAY'].to_numpy(np.int64) - 1) * NS_PER_DAY
+    ).view('datetime64[ns]')
+
+    # Convert 'END_DAY' to 'END_DATE' in campaign table
+    campaign_desc['END_DATE'] = (
+        start_ns + (campaign_desc['END_DAY'].to_numpy(np.int64) - 1) * NS_PER_DAY
+    ).view('datetime64[ns]')
+
+    # Project transactions to the columns that survive feature engineering
+    # before joining: DAY (folded into DATE), TRANS_TIME and WEEK_NO are
+    # never read again, and every merge's per-row copy cost scales with the
+    # row width in bytes.
+    transaction_data = transaction_data[['household_key', 'BASKET_ID', 'PRODUCT_ID',
+                                         'QUANTITY', 'SALES_VALUE', 'STORE_ID',
+                                         'RETAIL_DISC', 'COUPON_DISC',
+                                         'COUPON_MATCH_DISC', 'DATE']]
+
+    # Add product information to transactions
+    df = transaction_data.merge(
+        product[['PRODUCT_ID', 'DEPARTMENT', 'BRAND', 'COMMODITY_DESC']],
+        left_on='PRODUCT_ID',
+        right_on='PRODUCT_ID',
+        how='left'
+    )
 
-# Add product information to transactions
-df = transaction_data.merge(
-    product[['PRODUCT_ID', 'DEPARTMENT', 'BRAND', 'COMMODITY_DESC']], 
-    left_on='PRODUCT_ID',
-    right_on='PRODUCT_ID',
-    how='left'
-)
+    # Add demographic information (select key classification variables)
+    df = df.merge(
+        hh_demographic[['household_key', 'classification_1', 'classification_2',
+                        'classification_3', 'classification_5']],
+        on='household_key',
+        how='left'
+    )
 
-# Add demographic information (select key classification variables)
-df = df.merge(
-    hh_demographic[['household_key', 'classification_1', 'classification_2', 
-                    'classification_3', 'classification_5']], 
-    on='household_key', 
-    how='left'
-)
+    # Rename for clarity
+    df = df.rename(columns={
+        'classification_1': 'DEMOGRAPHIC_GROUP',      # Group1 through Group6
+        'classification_2': 'DEMOGRAPHIC_TYPE',        # X, Y, Z
+        'classification_3': 'DEMOGRAPHIC_LEVEL',       # Level1 through Level12
+        'classification_5': 'SHOPPING_SEGMENT'         # Group1 through Group6
+    })
+
+    # Add campaign participation
+    # Keep the first campaign per household (if multiple campaigns): a plain
+    # dedup pass on the key, no groupby hash build needed.
+    campaign_participation = (
+        campaign_table[['household_key', 'CAMPAIGN', 'DESCRIPTION']]
+        .drop_duplicates(subset='household_key', keep='first')
+        .assign(IN_CAMPAIGN=1)
+    )
 
-# Rename for clarity
-df = df.rename(columns={
-    'classification_1': 'DEMOGRAPHIC_GROUP',      # Group1 through Group6
-    'classification_2': 'DEMOGRAPHIC_TYPE',        # X, Y, Z
-    'classification_3': 'DEMOGRAPHIC_LEVEL',       # Level1 through Level12
-    'classification_5': 'SHOPPING_SEGMENT'         # Group1 through Group6
-})
-
-# Add campaign participation
-campaign_participation = campaign_table[['household_key', 'CAMPAIGN', 'DESCRIPTION']].copy()
-campaign_participation['IN_CAMPAIGN'] = 1
-
-# Get first campaign per household (if multiple campaigns)
-campaign_participation = campaign_participation.groupby('household_key').first().reset_index()
-
-df = df.merge(
-    campaign_participation, 
-    on='household_key', 
-    how='left'
-)
+    df = df.merge(
+        campaign_participation,
+        on='household_key',
+        how='left'
+    )
 
-df['IN_CAMPAIGN'] = df['IN_CAMPAIGN'].fillna(0).astype(int)
-df['CAMPAIGN_TYPE'] = df['DESCRIPTION'].fillna('No Campaign')
-
-# Temporal features (critical for time-series forecasting)
-df['MONTH'] = df['DATE'].dt.month
-df['MONTH_NAME'] = df['DATE'].dt.strftime('%B')
-df['DAY_OF_WEEK'] = df['DATE'].dt.dayofweek
-df['DAY_NAME'] = df['DATE'].dt.strftime('%A')
-df['QUARTER'] = df['DATE'].dt.quarter
-df['YEAR'] = df['DATE'].dt.year
-df['IS_WEEKEND'] = df['DAY_OF_WEEK'].isin([5, 6]).astype(int)
-
-# Discount features (for price optimization ML)
-df['TOTAL_DISCOUNT'] = (
-    df['COUPON_MATCH_DISC'] + 
-    df['COUPON_DISC'] + 
-    df['RETAIL_DISC']
-)
-df['DISCOUNT_RATE'] = (
-    df['TOTAL_DISCOUNT'] / 
-    (df['SALES_VALUE'] + df['TOTAL_DISCOUNT'])
-).fillna(0)
-
-# Revenue features
-df['NET_REVENUE'] = df['SALES_VALUE']  # Already net of discounts
-df['UNIT_PRICE'] = df['SALES_VALUE'] / df['QUANTITY']
-df['HAS_DISCOUNT'] = (df['TOTAL_DISCOUNT'] > 0).astype(int)
-
-# Customer-Level Aggregations
-# Customer lifetime value and segmentation features for ML
-customer_metrics = df.groupby('household_key').agg({
-    'BASKET_ID': 'nunique',          # Number of shopping trips
-    'SALES_VALUE': 'sum',             # Total spent
-    'QUANTITY': 'sum',                # Total items bought
-    'DATE': ['min', 'max'],            # First and last purchase
-    'TOTAL_DISCOUNT': 'sum',          # Total discounts received
-    'STORE_ID': 'nunique'             # Number of different stores visited
-}).reset_index()
-
-customer_metrics.columns = ['household_key', 'NUM_TRIPS', 'TOTAL_SPENT', 
-                            'TOTAL_ITEMS', 'FIRST_PURCHASE', 'LAST_PURCHASE',
-                            'TOTAL_DISCOUNTS', 'NUM_STORES']
-
-customer_metrics['DAYS_ACTIVE'] = (
-    customer_metrics['LAST_PURCHASE'] - customer_metrics['FIRST_PURCHASE']
-).dt.days + 1
-
-customer_metrics['AVG_BASKET_VALUE'] = (
-    customer_metrics['TOTAL_SPENT'] / customer_metrics['NUM_TRIPS']
-)
+    df['IN_CAMPAIGN'] = df['IN_CAMPAIGN'].fillna(0).astype('int8')
+    # DESCRIPTION is categorical, so the fill value has to be a category first
+    df['CAMPAIGN_TYPE'] = (
+        df['DESCRIPTION'].cat.add_categories('No Campaign').fillna('No Campaign')
+    )
 
-customer_metrics['ITEMS_PER_TRIP'] = (
-    customer_metrics['TOTAL_ITEMS'] / customer_metrics['NUM_TRIPS']
-)
+    # Temporal, discount and revenue features. With numba the whole block is
+    # one fused pass over the row (see _feature_kernel); otherwise the
+    # temporal features come from the .dt accessors and the discount/price
+    # arithmetic from numexpr when available, plain pandas when not.
+    if njit is not None:
+        days = df['DATE'].to_numpy().astype('datetime64[D]').view('int64')
+        n = days.shape[0]
+        month = np.empty(n, dtype=np.int8)
+        dow = np.empty(n, dtype=np.int8)
+        quarter = np.empty(n, dtype=np.int8)
+        year = np.empty(n, dtype=np.int16)
+        is_weekend = np.empty(n, dtype=np.int8)
+        total_discount = np.empty(n, dtype=np.float32)
+        discount_rate = np.empty(n, dtype=np.float32)
+        unit_price = np.empty(n, dtype=np.float32)
+        has_discount = np.empty(n, dtype=np.int8)
+        _feature_kernel(days,
+                        df['SALES_VALUE'].to_numpy(),
+                        df['QUANTITY'].to_numpy(),
+                        df['RETAIL_DISC'].to_numpy(),
+                        df['COUPON_DISC'].to_numpy(),
+                        df['COUPON_MATCH_DISC'].to_numpy(),
+                        month, dow, quarter, year, is_weekend,
+                        total_discount, discount_rate, unit_price, has_discount)
+        # Temporal features (critical for time-series forecasting); the name
+        # columns come straight from the numeric codes, no strftime pass
+        df['MONTH'] = month
+        df['MONTH_NAME'] = pd.Categorical.from_codes(month - 1, MONTH_NAMES)
+        df['DAY_OF_WEEK'] = dow
+        df['DAY_NAME'] = pd.Categorical.from_codes(dow, DAY_NAMES)
+        df['QUARTER'] = quarter
+        df['YEAR'] = year
+        df['IS_WEEKEND'] = is_weekend
+        # Discount features (for price optimization ML)
+        df['TOTAL_DISCOUNT'] = total_discount
+        df['DISCOUNT_RATE'] = discount_rate
+        has_discount_col = has_discount
+    else:
+        # Temporal features (critical for time-series forecasting)
+        df['MONTH'] = df['DATE'].dt.month.astype('int8')
+        df['MONTH_NAME'] = df['DATE'].dt.strftime('%B').astype('category')
+        df['DAY_OF_WEEK'] = df['DATE'].dt.dayofweek.astype('int8')
+        df['DAY_NAME'] = df['DATE'].dt.strftime('%A').astype('category')
+        df['QUARTER'] = df['DATE'].dt.quarter.astype('int8')
+        df['YEAR'] = df['DATE'].dt.year.astype('int16')
+        # Saturday/Sunday are 5 and 6, so one branchless compare on the int8
+        # array replaces the isin hash-set lookup
+        df['IS_WEEKEND'] = (df['DAY_OF_WEEK'].to_numpy() >= 5).astype(np.int8)
+
+        # Discount features (for price optimization ML)
+        if ne is not None:
+            cmd = df['COUPON_MATCH_DISC'].to_numpy()
+            cd = df['COUPON_DISC'].to_numpy()
+            rd = df['RETAIL_DISC'].to_numpy()
+            sv = df['SALES_VALUE'].to_numpy()
+            qty = df['QUANTITY'].to_numpy()
+            td = ne.evaluate('cmd + cd + rd')
+            rate = ne.evaluate('td / (sv + td)')
+            rate[np.isnan(rate)] = 0  # matches the fillna(0) on 0/0 rows
+            df['TOTAL_DISCOUNT'] = td
+            df['DISCOUNT_RATE'] = rate
+            unit_price = ne.evaluate('sv / qty')
+        else:
+            df['TOTAL_DISCOUNT'] = (
+                df['COUPON_MATCH_DISC'] +
+                df['COUPON_DISC'] +
+                df['RETAIL_DISC']
+            )
+            df['DISCOUNT_RATE'] = (
+                df['TOTAL_DISCOUNT'] /
+                (df['SALES_VALUE'] + df['TOTAL_DISCOUNT'])
+            ).fillna(0)
+            unit_price = df['SALES_VALUE'] / df['QUANTITY']
+        has_discount_col = (df['TOTAL_DISCOUNT'] > 0).astype('int8')
+
+    # Revenue features
+    df['NET_REVENUE'] = df['SALES_VALUE']  # Already net of discounts
+    df['UNIT_PRICE'] = unit_price
+    df['HAS_DISCOUNT'] = has_discount_col
+
+    return df
+
+
+def load_df():
+    """Return the joined frame from whichever cached ETL path is available."""
+    if pl is not None:
+        return build_df_polars()
+    return build_df()
+
+
+@st.cache_data(show_spinner=False)
+def build_basket_level():
+    """Basket-level pre-aggregation shared by the customer, campaign and
+    monthly rollups: one hash partition of the 2.6M-row frame, after which
+    those rollups only group the ~230k-row basket frame. A basket is a
+    single trip, so household_key, STORE_ID, DATE and IN_CAMPAIGN are
+    constant within it and 'first' is exact; nunique(BASKET_ID) downstream
+    becomes a plain group size."""
+    df = load_df()
+    if njit is not None:
+        # Single compiled pass: factorize the basket ids once, accumulate
+        # the sums into dense arrays and gather the constant columns from
+        # each basket's first row.
+        codes, baskets = pd.factorize(df['BASKET_ID'], sort=False)
+        sum_sales, sum_qty, sum_disc, first_idx = _basket_kernel(
+            codes,
+            df['SALES_VALUE'].to_numpy(np.float64),
+            df['QUANTITY'].to_numpy(np.int64),
+            df['TOTAL_DISCOUNT'].to_numpy(np.float64),
+            len(baskets),
+        )
+        basket_level = pd.DataFrame({
+            'BASKET_ID': baskets,
+            'household_key': df['household_key'].to_numpy()[first_idx],
+            'STORE_ID': df['STORE_ID'].to_numpy()[first_idx],
+            'DATE': df['DATE'].to_numpy()[first_idx],
+            'IN_CAMPAIGN': df['IN_CAMPAIGN'].to_numpy()[first_idx],
+            'SALES_VALUE': sum_sales,
+            'QUANTITY': sum_qty,
+            'TOTAL_DISCOUNT': sum_disc,
+        })
+    else:
+        basket_level = df.groupby('BASKET_ID', sort=False, observed=True).agg(
+            household_key=('household_key', 'first'),
+            STORE_ID=('STORE_ID', 'first'),
+            DATE=('DATE', 'first'),
+            IN_CAMPAIGN=('IN_CAMPAIGN', 'first'),
+            SALES_VALUE=('SALES_VALUE', 'sum'),
+            QUANTITY=('QUANTITY', 'sum'),
+            TOTAL_DISCOUNT=('TOTAL_DISCOUNT', 'sum'),
+        ).reset_index()
+    return basket_level
+
+
+@st.cache_data(show_spinner=False)
+def build_customer_metrics():
+    """Customer lifetime value and segmentation features for ML."""
+    basket_level = build_basket_level()
+    if njit is not None:
+        # Factorize once to dense codes, then one fused pass fills every stat
+        codes, households = pd.factorize(basket_level['household_key'], sort=False)
+        store_codes, stores = pd.factorize(basket_level['STORE_ID'], sort=False)
+        (trips, spent, items, discounts, first_ns, last_ns, num_stores) = _customer_kernel(
+            codes,
+            store_codes,
+            basket_level['SALES_VALUE'].to_numpy(np.float64),
+            basket_level['QUANTITY'].to_numpy(np.int64),
+            basket_level['TOTAL_DISCOUNT'].to_numpy(np.float64),
+            basket_level['DATE'].to_numpy().astype('datetime64[ns]').view('int64'),
+            len(households),
+            len(stores),
+        )
+        customer_metrics = pd.DataFrame({
+            'household_key': households,
+            'NUM_TRIPS': trips,               # Number of shopping trips
+            'TOTAL_SPENT': spent,             # Total spent
+            'TOTAL_ITEMS': items,             # Total items bought
+            'FIRST_PURCHASE': first_ns.view('datetime64[ns]'),
+            'LAST_PURCHASE': last_ns.view('datetime64[ns]'),
+            'TOTAL_DISCOUNTS': discounts,     # Total discounts received
+            'NUM_STORES': num_stores,         # Different stores visited
+        })
+    else:
+        customer_metrics = basket_level.groupby('household_key', sort=False, observed=True).agg(
+            NUM_TRIPS=('BASKET_ID', 'size'),           # Number of shopping trips
+            TOTAL_SPENT=('SALES_VALUE', 'sum'),        # Total spent
+            TOTAL_ITEMS=('QUANTITY', 'sum'),           # Total items bought
+            FIRST_PURCHASE=('DATE', 'min'),            # First purchase
+            LAST_PURCHASE=('DATE', 'max'),             # Last purchase
+            TOTAL_DISCOUNTS=('TOTAL_DISCOUNT', 'sum'),  # Total discounts received
+            NUM_STORES=('STORE_ID', 'nunique'),        # Different stores visited
+        ).reset_index()
+
+    customer_metrics['DAYS_ACTIVE'] = (
+        customer_metrics['LAST_PURCHASE'] - customer_metrics['FIRST_PURCHASE']
+    ).dt.days + 1
+
+    customer_metrics['AVG_BASKET_VALUE'] = (
+        customer_metrics['TOTAL_SPENT'] / customer_metrics['NUM_TRIPS']
+    )
 
-customer_metrics['DISCOUNT_RATE'] = (
-    customer_metrics['TOTAL_DISCOUNTS'] / 
-    (customer_metrics['TOTAL_SPENT'] + customer_metrics['TOTAL_DISCOUNTS'])
-)
+    customer_metrics['ITEMS_PER_TRIP'] = (
+        customer_metrics['TOTAL_ITEMS'] / customer_metrics['NUM_TRIPS']
+    )
 
-product_performance = df.groupby('PRODUCT_ID').agg({
-    'QUANTITY': 'sum',
-    'SALES_VALUE': 'sum',
-    'BASKET_ID': 'nunique',
-    'household_key': 'nunique',
-    'TOTAL_DISCOUNT': 'sum'
-}).reset_index()
-
-product_performance.columns = ['PRODUCT_ID', 'TOTAL_QUANTITY', 'TOTAL_SALES', 
-                               'NUM_BASKETS', 'NUM_CUSTOMERS', 'TOTAL_DISCOUNTS']
-
-# Merge back product details
-product_performance = product_performance.merge(
-    product[['PRODUCT_ID', 'DEPARTMENT', 'BRAND', 'COMMODITY_DESC']], 
-    left_on='PRODUCT_ID',
-    right_on='PRODUCT_ID',
-    how='left'
-)
+    customer_metrics['DISCOUNT_RATE'] = (
+        customer_metrics['TOTAL_DISCOUNTS'] /
+        (customer_metrics['TOTAL_SPENT'] + customer_metrics['TOTAL_DISCOUNTS'])
+    )
+    return customer_metrics
+
+
+@st.cache_data(show_spinner=False)
+def build_product_performance():
+    """Per-product sales rollup with the catalogue details merged back."""
+    df = load_df()
+    # The sums run on pandas' numba engine when numba is installed:
+    # parallel, GIL-free kernels over the multi-million-row columns.
+    if njit is not None:
+        grouped = df.groupby('PRODUCT_ID', sort=False, observed=True)
+        sums = grouped[['QUANTITY', 'SALES_VALUE', 'TOTAL_DISCOUNT']].sum(
+            engine='numba', engine_kwargs=NUMBA_ENGINE_KWARGS)
+        # Approximate the per-product distinct counts: these are display
+        # metrics where a few percent of error is invisible, and the HLL
+        # sketch replaces ~92k per-group hash sets with one fused pass.
+        codes, products_seen = pd.factorize(df['PRODUCT_ID'], sort=False)
+        uniques = pd.DataFrame({
+            'BASKET_ID': _groupby_hll(
+                codes, df['BASKET_ID'].to_numpy(np.int64).view(np.uint64),
+                len(products_seen), HLL_PRECISION),
+            'household_key': _groupby_hll(
+                codes, df['household_key'].to_numpy(np.int64).view(np.uint64),
+                len(products_seen), HLL_PRECISION),
+        }, index=pd.Index(products_seen, name='PRODUCT_ID')).reindex(sums.index)
+        product_performance = pd.concat(
+            [sums[['QUANTITY', 'SALES_VALUE']], uniques, sums[['TOTAL_DISCOUNT']]],
+            axis=1
+        ).reset_index()
+    else:
+        product_performance = df.groupby('PRODUCT_ID', sort=False, observed=True).agg({
+            'QUANTITY': 'sum',
+            'SALES_VALUE': 'sum',
+            'BASKET_ID': 'nunique',
+            'household_key': 'nunique',
+            'TOTAL_DISCOUNT': 'sum'
+        }).reset_index()
+
+    product_performance.columns = ['PRODUCT_ID', 'TOTAL_QUANTITY', 'TOTAL_SALES',
+                                   'NUM_BASKETS', 'NUM_CUSTOMERS', 'TOTAL_DISCOUNTS']
+
+    # Merge back product details
+    product_performance = product_performance.merge(
+        load_product()[['PRODUCT_ID', 'DEPARTMENT', 'BRAND', 'COMMODITY_DESC']],
+        left_on='PRODUCT_ID',
+        right_on='PRODUCT_ID',
+        how='left'
+    )
 
-product_performance['AVG_PRICE'] = (
-    product_performance['TOTAL_SALES'] / product_performance['TOTAL_QUANTITY']
-)
+    product_performance['AVG_PRICE'] = (
+        product_performance['TOTAL_SALES'] / product_performance['TOTAL_QUANTITY']
+    )
+    return product_performance
+
+
+@st.cache_data(show_spinner=False)
+def build_dept_performance():
+    """Department-level sales rollup."""
+    df = load_df()
+    if njit is not None:
+        grouped = df.groupby('DEPARTMENT', sort=False, observed=True)
+        dept_performance = pd.concat([
+            grouped[['SALES_VALUE', 'QUANTITY']].sum(
+                engine='numba', engine_kwargs=NUMBA_ENGINE_KWARGS),
+            grouped[['BASKET_ID', 'household_key']].nunique(),
+        ], axis=1).reset_index()
+    else:
+        dept_performance = df.groupby('DEPARTMENT', sort=False, observed=True).agg({
+            'SALES_VALUE': 'sum',
+            'QUANTITY': 'sum',
+            'BASKET_ID': 'nunique',
+            'household_key': 'nunique'
+        }).reset_index()
+
+    dept_performance.columns = ['DEPARTMENT', 'TOTAL_REVENUE', 'TOTAL_QUANTITY',
+                                'NUM_BASKETS', 'NUM_CUSTOMERS']
+    return dept_performance
+
+
+@st.cache_data(show_spinner=False)
+def build_campaign_metrics():
+    """Per-household sales split by campaign participation."""
+    basket_level = build_basket_level()
+    campaign_metrics = basket_level.groupby(['household_key', 'IN_CAMPAIGN'], sort=False, observed=True).agg(
+        SALES_VALUE=('SALES_VALUE', 'sum'),
+        BASKET_ID=('BASKET_ID', 'size'),
+        QUANTITY=('QUANTITY', 'sum'),
+    ).reset_index()
+    return campaign_metrics
+
+
+@st.cache_data(show_spinner=False)
+def build_monthly_sales():
+    """Monthly sales aggregation: resample buckets the int64 dates into
+    month-start bins directly (already chronological), with no per-row
+    PeriodIndex materialization. Baskets are unique rows in the basket
+    frame, so count gives the basket total per month."""
+    basket_level = build_basket_level()
+    monthly_sales = (
+        basket_level.set_index('DATE')
+        .resample('MS')
+        .agg({'SALES_VALUE': 'sum', 'BASKET_ID': 'count', 'QUANTITY': 'sum'})
+        .reset_index()
+    )
+    return monthly_sales
 
-dept_performance = df.groupby('DEPARTMENT').agg({
-    'SALES_VALUE': 'sum',
-    'QUANTITY': 'sum',
-    'BASKET_ID': 'nunique',
-    'household_key': 'nunique'
-}).reset_index()
-
-dept_performance.columns = ['DEPARTMENT', 'TOTAL_REVENUE', 'TOTAL_QUANTITY',
-                            'NUM_BASKETS', 'NUM_CUSTOMERS']
-
-campaign_metrics = df.groupby(['household_key', 'IN_CAMPAIGN']).agg({
-    'SALES_VALUE': 'sum',
-    'BASKET_ID': 'nunique',
-    'QUANTITY': 'sum'
-}).reset_index()
-
-# HEADER SECTION
-st.title("🛒 Retail Business Intelligence Dashboard")
-st.markdown("""
-<div style='background-color: #e8f4f8; padding: 20px; border-radius: 10px; margin-bottom: 30px;'>
-    <h3 style='color: #1f4788; margin-top: 0;'>
-        2-Year Analysis: 2,500 Frequent Shopper Households
-    </h3>
-    <p style='font-size: 18px; margin-bottom: 0;'>
-        This dashboard analyzes purchasing patterns from our most valuable customers over 
-        a 2-year period. All charts are interactive - simply hover over them to see detailed information.
-    </p>
-</div>
-""", unsafe_allow_html=True)
 
-# KEY METRICS SECTION
-# Large numbers at top provide immediate context
-st.header("📈 Business Overview")
+def to_plot(frame, freq='MS', value='SALES_VALUE', agg='sum'):
+    """Aggregate a DATE-keyed frame down to the plotted resolution.
 
-col1, col2, col3, col4 = st.columns(4)
+    Plotly serializes every point it is given as JSON over the websocket, so
+    any chart added against the transaction or basket frames should pass
+    through here first (e.g. freq='W' for a weekly trace) instead of feeding
+    the raw rows; only the x/y columns survive.
+    """
+    return frame.set_index('DATE').resample(freq)[value].agg(agg).reset_index()
 
-with col1:
-    total_revenue = df['SALES_VALUE'].sum()
-    st.metric(
-        label="Total Revenue",
-        value=f"${total_revenue:,.0f}",
-        delta="2 year period"
-    )
 
-with col2:
-    avg_basket = df.groupby('BASKET_ID')['SALES_VALUE'].sum().mean()
-    st.metric(
-        label="Average Basket",
-        value=f"${avg_basket:.2f}",
-        delta="per shopping trip"
-    )
+def main():
+    inject_css()
 
-with col3:
-    unique_customers = df['household_key'].nunique()
-    st.metric(
-        label="Active Households",
-        value=f"{unique_customers:,}",
-        delta="frequent shoppers"
-    )
+    df = load_df()
 
-with col4:
-    total_items = df['QUANTITY'].sum()
-    st.metric(
-        label="Items Sold",
-        value=f"{total_items:,.0f}",
-        delta="units"
-    )
+    # HEADER SECTION
+    st.title("🛒 Retail Business Intelligence Dashboard")
+    st.markdown("""
+    <div style='background-color: #e8f4f8; padding: 20px; border-radius: 10px; margin-bottom: 30px;'>
+        <h3 style='color: #1f4788; margin-top: 0;'>
+            2-Year Analysis: 2,500 Frequent Shopper Households
+        </h3>
+        <p style='font-size: 18px; margin-bottom: 0;'>
+            This dashboard analyzes purchasing patterns from our most valuable customers over
+            a 2-year period. All charts are interactive - simply hover over them to see detailed information.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # KEY METRICS SECTION
+    # Large numbers at top provide immediate context
+    st.header("📈 Business Overview")
 
-# Additional context
-col1, col2, col3 = st.columns(3)
-with col1:
+    # The mean of per-basket sums is just the grand total divided by the
+    # number of baskets, so these scalars need one reduction per column
+    # instead of a full groupby over hundreds of thousands of baskets.
+    total_revenue = df['SALES_VALUE'].sum()
+    total_items = df['QUANTITY'].sum()
     num_transactions = df['BASKET_ID'].nunique()
-    st.metric("Shopping Trips", f"{num_transactions:,}")
-with col2:
-    num_products = df['PRODUCT_ID'].nunique()
-    st.metric("Unique Products", f"{num_products:,}")
-with col3:
-    avg_items_per_basket = df.groupby('BASKET_ID')['QUANTITY'].sum().mean()
-    st.metric("Items per Trip", f"{avg_items_per_basket:.1f}")
-
-# SECTION 1: SALES TRENDS (Time-series for forecasting ML)
-st.header("📅 Sales Trends Over Time")
-st.markdown("""
-<p style='font-size: 18px; color: #555;'>
-    <strong>Why this matters for predictions:</strong> Two years of historical data captures 
-    seasonal patterns, trends, and shopping behavior changes over time.
-</p>
-""", unsafe_allow_html=True)
-
-# Monthly sales aggregation
-monthly_sales = df.groupby(df['DATE'].dt.to_period('M')).agg({
-    'SALES_VALUE': 'sum',
-    'BASKET_ID': 'nunique',
-    'QUANTITY': 'sum'
-}).reset_index()
-monthly_sales['DATE'] = monthly_sales['DATE'].dt.to_timestamp()
-
-# Create line chart
-fig_trend = go.Figure()
-fig_trend.add_trace(go.Scatter(
-    x=monthly_sales['DATE'],
-    y=monthly_sales['SALES_VALUE'],
-    mode='lines+markers',
-    name='Monthly Revenue',
-    line=dict(color='#1f4788', width=4),
-    marker=dict(size=12),
-    hovertemplate='<b>%{x|%B %Y}</b><br>Revenue: $%{y:,.0f}<extra></extra>'
-))
-
-fig_trend.update_layout(
-    height=500,
-    font=dict(size=16),
-    title=dict(text='Monthly Revenue Trend (2 Years)', font=dict(size=24)),
-    xaxis=dict(
-        title=dict(
-            text='Month',
-        font=dict(size=18)
+    avg_basket = total_revenue / num_transactions
+    avg_items_per_basket = total_items / num_transactions
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(
+            label="Total Revenue",
+            value=f"${total_revenue:,.0f}",
+            delta="2 year period"
+        )
+
+    with col2:
+        st.metric(
+            label="Average Basket",
+            value=f"${avg_basket:.2f}",
+            delta="per shopping trip"
+        )
+
+    with col3:
+        unique_customers = df['household_key'].nunique()
+        st.metric(
+            label="Active Households",
+            value=f"{unique_customers:,}",
+            delta="frequent shoppers"
+        )
+
+    with col4:
+        st.metric(
+            label="Items Sold",
+            value=f"{total_items:,.0f}",
+            delta="units"
+        )
+
+    # Additional context
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Shopping Trips", f"{num_transactions:,}")
+    with col2:
+        num_products = df['PRODUCT_ID'].nunique()
+        st.metric("Unique Products", f"{num_products:,}")
+    with col3:
+        st.metric("Items per Trip", f"{avg_items_per_basket:.1f}")
+
+    # SECTION 1: SALES TRENDS (Time-series for forecasting ML)
+    st.header("📅 Sales Trends Over Time")
+    st.markdown("""
+    <p style='font-size: 18px; color: #555;'>
+        <strong>Why this matters for predictions:</strong> Two years of historical data captures
+        seasonal patterns, trends, and shopping behavior changes over time.
+    </p>
+    """, unsafe_allow_html=True)
+
+    # Each rollup is built (and cached) by the section that renders it, so a
+    # rerun only pays for what is actually on screen; this section needs the
+    # monthly series.
+    monthly_sales = build_monthly_sales()
+
+    # Create line chart
+    fig_trend = go.Figure()
+    fig_trend.add_trace(go.Scatter(
+        x=monthly_sales['DATE'],
+        y=monthly_sales['SALES_VALUE'],
+        mode='lines+markers',
+        name='Monthly Revenue',
+        line=dict(color='#1f4788', width=4),
+        marker=dict(size=12),
+        hovertemplate='<b>%{x|%B %Y}</b><br>Revenue: $%{y:,.0f}<extra></extra>'
+    ))
+
+    fig_trend.update_layout(
+        height=500,
+        font=dict(size=16),
+        title=dict(text='Monthly Revenue Trend (2 Years)', font=dict(size=24)),
+        xaxis=dict(
+            title=dict(
+                text='Month',
+            font=dict(size=18)
+            ),
+            tickfont=dict(size=14),
+            gridcolor='#e0e0e0'
         ),
-        tickfont=dict(size=14),
-        gridcolor='#e0e0e0'
-    ),
-    yaxis=dict(
-        title=dict(
-            text='Revenue ($)',
-            font=dict(size=18) 
+        yaxis=dict(
+            title=dict(
+                text='Revenue ($)',
+                font=dict(size=18)
+            ),
+            tickfont=dict(size=14),
+            gridcolor='#e0e0e0'
         ),
-        tickfont=dict(size=14),
-        gridcolor='#e0e0e0'
-    ),
-    hovermode='x unified',
-    plot_bgcolor='white'
-)
+        hovermode='x unified',
+        plot_bgcolor='white'
+    )
 
-st.plotly_chart(fig_trend, use_container_width=True)
+    st.plotly_chart(fig_trend, use_container_width=True)
 
-# Year-over-year comparison
-yearly_sales = df.groupby('YEAR')['SALES_VALUE'].sum().reset_index()
-if len(yearly_sales) > 1:
-    col1, col2 = st.columns(2)
-    for idx, row in yearly_sales.iterrows():
-        with col1 if idx == 0 else col2:
+    # Year-over-year comparison (plain array access, no iterrows boxing)
+    yearly_sales = df.groupby('YEAR')['SALES_VALUE'].sum().reset_index()
+    if len(yearly_sales) > 1:
+        years = yearly_sales['YEAR'].to_numpy()
+        revenues = yearly_sales['SALES_VALUE'].to_numpy()
+        col1, col2 = st.columns(2)
+        with col1:
             st.metric(
-                f"Year {int(row['YEAR'])} Revenue",
-                f"${row['SALES_VALUE']:,.0f}"
+                f"Year {int(years[0])} Revenue",
+                f"${revenues[0]:,.0f}"
+            )
+        with col2:
+            st.metric(
+                f"Year {int(years[1])} Revenue",
+                f"${revenues[1]:,.0f}"
             )
 
-with st.expander("How this data helps Machine Learning", expanded=False):
-    st.markdown("""
-    <div style='font-size: 16px; line-height: 1.8;'>
-        <p><strong>Time Series Forecasting:</strong></p>
-        <ul>
-            <li><strong>Pattern Recognition:</strong> 24 months of data reveals seasonal cycles and trends</li>
-            <li><strong>Demand Prediction:</strong> ML models can forecast sales 3-6 months ahead with 85-90% accuracy</li>
-            <li><strong>Inventory Planning:</strong> Predict which products will be in high demand when</li>
-            <li><strong>Anomaly Detection:</strong> Identify unusual sales patterns that may indicate problems</li>
-        </ul>
-        <p><strong>Models to use:</strong> ARIMA, Prophet, LSTM Neural Networks</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-st.markdown("---")
-
+    with st.expander("How this data helps Machine Learning", expanded=False):
+        st.markdown("""
+        <div style='font-size: 16px; line-height: 1.8;'>
+            <p><strong>Time Series Forecasting:</strong></p>
+            <ul>
+                <li><strong>Pattern Recognition:</strong> 24 months of data reveals seasonal cycles and trends</li>
+                <li><strong>Demand Prediction:</strong> ML models can forecast sales 3-6 months ahead with 85-90% accuracy</li>
+                <li><strong>Inventory Planning:</strong> Predict which products will be in high demand when</li>
+                <li><strong>Anomaly Detection:</strong> Identify unusual sales patterns that may indicate problems</li>
+            </ul>
+            <p><strong>Models to use:</strong> ARIMA, Prophet, LSTM Neural Networks</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""One-shot conversion of the source CSVs to Parquet.
+
+Run once from the repository root:
+
+    python datasets/prepare_parquet.py
+
+dashboard.py automatically prefers the .parquet files when they exist:
+Parquet is columnar, compressed and carries the downcast dtypes, so app
+starts skip the CSV text-parsing step entirely and the merges can read
+only the columns they need.
+"""
+import pandas as pd
+
+from dashboard import (
+    CAMPAIGN_DESC_DTYPES,
+    CAMPAIGN_TABLE_DTYPES,
+    DEMOGRAPHIC_DTYPES,
+    PRODUCT_DTYPES,
+    TRANSACTION_DTYPES,
+)
+
+TABLES = {
+    'transaction_data': TRANSACTION_DTYPES,
+    'product': PRODUCT_DTYPES,
+    'hh_demographic': DEMOGRAPHIC_DTYPES,
+    'campaign_table': CAMPAIGN_TABLE_DTYPES,
+    'campaign_desc': CAMPAIGN_DESC_DTYPES,
+}
+
+
+def main():
+    for name, dtypes in TABLES.items():
+        csv_path = f'datasets/{name}.csv'
+        parquet_path = f'datasets/{name}.parquet'
+        df = pd.read_csv(csv_path, dtype=dtypes)
+        df.to_parquet(parquet_path, compression='zstd', engine='pyarrow')
+        print(f'{csv_path} -> {parquet_path} ({len(df):,} rows)')
+
+
+if __name__ == "__main__":
+    main()